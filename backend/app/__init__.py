@@ -1,28 +1,78 @@
-from flask import Flask
+from flask import Flask, g, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
 import os
+import queue
 from datetime import timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import configure_mappers
 
-# Load environment variables from .env if present
+# Load environment variables from .env if present. This must run before
+# .config is imported: the config classes read os.environ at class creation.
 load_dotenv()
 
-db = SQLAlchemy()
+from .config import get_config
+from .redis_cache import RedisCache
+from .json_provider import ORJSONProvider
+
+# Keep committed instances loaded so routes can serialize them without a re-SELECT
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 jwt = JWTManager()
 migrate = Migrate()
 limiter = Limiter(key_func=get_remote_address)
+cache = RedisCache()
+
+@limiter.request_filter
+def _skip_preflight():
+    # CORS preflights never reach the view; don't let them spend the budget
+    return request.method == 'OPTIONS'
+
+DEFAULT_CORS_ORIGINS = 'http://localhost:3000,http://localhost:3001'
+
+@lru_cache(maxsize=None)
+def _parse_origins(raw):
+    return tuple(o.strip() for o in raw.split(',') if o.strip())
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed during writes; the rest trims fsyncs and page misses
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA mmap_size=134217728')
+    cursor.execute('PRAGMA cache_size=-65536')
+    cursor.close()
+
+_log_listener = None
+
+def _configure_logging(level):
+    # Request threads only enqueue records; a background listener does the IO
+    global _log_listener
+    if _log_listener is None:
+        log_queue = queue.SimpleQueue()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        _log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        # No formatter here: prepare() would bake the level/name prefix into
+        # the message and the listener's handler would add it a second time
+        logging.getLogger().addHandler(QueueHandler(log_queue))
+    logging.getLogger().setLevel(level)
 
 def create_app():
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
     # Configuration via config classes
-    from .config import get_config
     config_obj = get_config(os.environ.get('APP_CONFIG', 'development'))
     app.config.from_object(config_obj)
 
@@ -36,19 +86,30 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    # Batch mode lets autogenerated migrations alter tables on SQLite
+    migrate.init_app(app, db, render_as_batch=True)
     limiter.init_app(app)
+    cache.init_app(app)
+    
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', _sqlite_pragmas)
     
     # Configure CORS to handle preflight requests properly
-    cors_origins = os.environ.get('CORS_ORIGINS', 'http://localhost:3000,http://localhost:3001')
     CORS(app, resources={
         r"/api/*": {
-            "origins": [o.strip() for o in cors_origins.split(',') if o.strip()],
+            "origins": list(_parse_origins(os.environ.get('CORS_ORIGINS', DEFAULT_CORS_ORIGINS))),
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization"],
+            # Let browsers reuse preflight results for a day
+            "max_age": 86400
         }
     })
     
+    @app.teardown_request
+    def _clear_model_cache(exc=None):
+        g.pop('_model_cache', None)
+
     # Configure Flask to handle URLs with and without trailing slashes
     app.url_map.strict_slashes = False
     
@@ -67,8 +128,12 @@ def create_app():
     app.register_blueprint(comments_bp, url_prefix='/api/comments')
     app.register_blueprint(reports_bp, url_prefix='/api/reports')
     
+    # Resolve backrefs (TIDP.responsible_user, Comment.user, ...) before the
+    # first request so routes can name them in loader options
+    configure_mappers()
+    
     # Configure logging
     log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
-    logging.basicConfig(level=getattr(logging, log_level, logging.INFO))
+    _configure_logging(getattr(logging, log_level, logging.INFO))
 
     return app
@@ -2,14 +2,51 @@ import os
 from datetime import timedelta
 
 
+def _engine_options(uri):
+    options = {
+        # Compiled SQL cache shared by every hot, parameterized lookup
+        'query_cache_size': int(os.environ.get('SQLALCHEMY_QUERY_CACHE_SIZE', 1200)),
+    }
+    # SQLite uses its own pool classes that don't accept sizing arguments
+    if not uri or uri.startswith('sqlite'):
+        return options
+    options.update({
+        'pool_size': int(os.environ.get('SQLALCHEMY_POOL_SIZE', 30)),
+        'max_overflow': int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', 10)),
+        'pool_recycle': int(os.environ.get('SQLALCHEMY_POOL_RECYCLE', 3600)),
+        'pool_pre_ping': True,
+    })
+    if uri.startswith('postgres'):
+        statement_timeout = int(os.environ.get('SQLALCHEMY_STATEMENT_TIMEOUT_MS', 5000))
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
 class BaseConfig:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     # Default to instance DB path; override via DATABASE_URL
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///instance/bep_app.db')
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=int(os.environ.get('JWT_ACCESS_TOKEN_HOURS', '24')))
     PROPAGATE_EXCEPTIONS = True
+    # Werkzeug hash spec for new passwords; existing hashes keep their own
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    # Rate limiter storage; point at Redis so limits are shared across workers
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URL', 'memory://')
+    RATELIMIT_STRATEGY = 'moving-window'
+    RATELIMIT_STORAGE_OPTIONS = {'socket_connect_timeout': 1}
+    # X-RateLimit-* response headers; each one costs a storage read per request
+    RATELIMIT_HEADERS_ENABLED = os.environ.get('RATELIMIT_HEADERS_ENABLED', 'false').lower() == 'true'
+    # Response cache for hot read endpoints; disabled when unset
+    REDIS_URL = os.environ.get('REDIS_URL')
+    # Background threads rendering queued PDF reports
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+    # Rendered reports older than this are deleted from instance/reports
+    REPORT_RETENTION_HOURS = int(os.environ.get('REPORT_RETENTION_HOURS', 24))
+    # A pending job not finished within this many seconds is reported as failed
+    REPORT_JOB_TIMEOUT = int(os.environ.get('REPORT_JOB_TIMEOUT', 600))
 
 
 class DevelopmentConfig(BaseConfig):
@@ -18,12 +55,18 @@ class DevelopmentConfig(BaseConfig):
 
 class ProductionConfig(BaseConfig):
     DEBUG = False
+    # No SQLite fallback in production; DATABASE_URL must be set
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
 
 
 class TestingConfig(BaseConfig):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    RATELIMIT_ENABLED = False
 
 
 def get_config(name: str):
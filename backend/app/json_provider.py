@@ -0,0 +1,22 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    # orjson serializes dicts, lists and datetimes natively; anything else
+    # (Decimal, UUID, dataclasses) goes through Flask's default hook
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps(obj), mimetype=self.mimetype)
+
+    def _dumps(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
@@ -0,0 +1,182 @@
+from io import BytesIO
+import importlib.util
+import logging
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from sqlalchemy.orm import joinedload
+from app import db
+from models.goal import Goal
+from models.tidp import TIDP
+from models.comment import Comment
+from models.user import User
+
+ROW_BATCH_SIZE = 500
+
+# reportlab dispatches string widths and text serialization to the C extension
+# from the rl_accel package when it is importable
+if importlib.util.find_spec('_rl_accel') is None:
+    logging.warning("rl_accel not installed; reportlab is using its pure-Python fallbacks")
+
+# Styles are never mutated while rendering, so every report shares one set
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=1  # Center alignment
+)
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=STYLES['Heading2'],
+    fontSize=16,
+    spaceAfter=12,
+    spaceBefore=20
+)
+PROJECT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.grey),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+# Shared by the goals and TIDP tables
+DATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+
+def _table_chunks(header, rows, col_widths, style):
+    # One Table per ROW_BATCH_SIZE rows: rows stream from the query in batches
+    # and reportlab only ever splits small tables across pages
+    chunk = [header]
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) > ROW_BATCH_SIZE:
+            yield _styled_table(chunk, col_widths, style)
+            chunk = [header]
+    if len(chunk) > 1:
+        yield _styled_table(chunk, col_widths, style)
+
+
+def _trunc(text, limit=50):
+    # Short cells (the common case) are returned as-is without copying
+    if not text or len(text) <= limit:
+        return text
+    return f'{text[:limit]}...'
+
+
+def _styled_table(data, col_widths, style):
+    table = Table(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(style)
+    return table
+
+
+def build_project_pdf(project):
+    project_id = project.id
+
+    # Create PDF buffer
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    
+    # Title
+    story.append(Paragraph(f"BIM Execution Plan - {project.name}", TITLE_STYLE))
+    story.append(Spacer(1, 20))
+    
+    # Project Information
+    story.append(Paragraph("Project Information", HEADING_STYLE))
+    project_info = [
+        ['Project Name:', project.name],
+        ['Location:', project.location],
+        ['Client:', project.client],
+        ['Delivery Method:', project.delivery_method],
+        ['Status:', project.status],
+        ['Created:', project.created_at.strftime('%B %d, %Y') if project.created_at else 'N/A']
+    ]
+    
+    if project.description:
+        project_info.append(['Description:', project.description])
+    
+    project_table = Table(project_info, colWidths=[2*inch, 4*inch])
+    project_table.setStyle(PROJECT_TABLE_STYLE)
+    story.append(project_table)
+    story.append(Spacer(1, 20))
+    
+    # Goals and BIM Uses
+    # Only the rendered columns are selected; plain tuples skip ORM hydration
+    goals = db.session.query(Goal.description, Goal.bim_use, Goal.success_metric, Goal.priority, Goal.status) \
+        .filter(Goal.project_id == project_id).yield_per(ROW_BATCH_SIZE)
+    goals_rows = (
+        [
+            _trunc(description),
+            bim_use,
+            _trunc(success_metric),
+            priority.title(),
+            status.title()
+        ]
+        for description, bim_use, success_metric, priority, status in goals
+    )
+    goals_tables = list(_table_chunks(
+        ['Description', 'BIM Use', 'Success Metric', 'Priority', 'Status'],
+        goals_rows,
+        [1.5*inch, 1.2*inch, 1.5*inch, 0.8*inch, 0.8*inch],
+        DATA_TABLE_STYLE
+    ))
+    if goals_tables:
+        story.append(Paragraph("Project Goals & BIM Uses", HEADING_STYLE))
+        story.extend(goals_tables)
+        story.append(Spacer(1, 20))
+    
+    # TIDP Entries
+    tidp_entries = db.session.query(TIDP.description, User.name, TIDP.due_date, TIDP.file_format, TIDP.status) \
+        .outerjoin(User, TIDP.responsible_user_id == User.id) \
+        .filter(TIDP.project_id == project_id).yield_per(ROW_BATCH_SIZE)
+    tidp_rows = (
+        [
+            _trunc(description, 40),
+            user_name or 'N/A',
+            due_date.strftime('%Y-%m-%d') if due_date else 'N/A',
+            file_format,
+            status.title()
+        ]
+        for description, user_name, due_date, file_format, status in tidp_entries
+    )
+    tidp_tables = list(_table_chunks(
+        ['Description', 'Responsible', 'Due Date', 'File Format', 'Status'],
+        tidp_rows,
+        [1.8*inch, 1.2*inch, 1*inch, 1*inch, 1*inch],
+        DATA_TABLE_STYLE
+    ))
+    if tidp_tables:
+        story.append(Paragraph("Task Information Delivery Plan (TIDP)", HEADING_STYLE))
+        story.extend(tidp_tables)
+        story.append(Spacer(1, 20))
+    
+    # Recent Comments
+    comments = Comment.query.options(joinedload(Comment.user)).filter_by(project_id=project_id, parent_id=None).order_by(Comment.created_at.desc()).limit(5).all()
+    if comments:
+        story.append(Paragraph("Recent Comments", HEADING_STYLE))
+        for comment in comments:
+            comment_text = f"<b>{comment.user.name}</b> - {comment.created_at.strftime('%Y-%m-%d %H:%M')}"
+            story.append(Paragraph(comment_text, STYLES['Normal']))
+            story.append(Paragraph(comment.text, STYLES['Normal']))
+            story.append(Spacer(1, 10))
+    
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
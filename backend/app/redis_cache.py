@@ -0,0 +1,46 @@
+import logging
+
+
+class RedisCache:
+    # Thin wrapper around redis-py. Without REDIS_URL every call is a miss, and
+    # Redis errors degrade to misses rather than failing the request.
+    def __init__(self):
+        self._client = None
+        self._errors = ()
+
+    def init_app(self, app):
+        url = app.config.get('REDIS_URL')
+        if not url:
+            return
+        import redis
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+        self._errors = (redis.RedisError,)
+
+    @property
+    def enabled(self):
+        return self._client is not None
+
+    def get(self, key):
+        if self._client is None:
+            return None
+        try:
+            return self._client.get(key)
+        except self._errors as exc:
+            logging.warning("Cache get failed for %s: %s", key, exc)
+            return None
+
+    def setex(self, key, ttl, value):
+        if self._client is None:
+            return
+        try:
+            self._client.setex(key, ttl, value)
+        except self._errors as exc:
+            logging.warning("Cache set failed for %s: %s", key, exc)
+
+    def delete(self, *keys):
+        if self._client is None:
+            return
+        try:
+            self._client.delete(*keys)
+        except self._errors as exc:
+            logging.warning("Cache delete failed for %s: %s", keys, exc)
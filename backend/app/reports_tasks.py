@@ -0,0 +1,149 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import os
+import re
+import threading
+import time
+from flask import current_app
+from app import db
+
+# Job ids are '<project_id>-<report etag>', so an unchanged project maps to the
+# same id and repeated requests reuse the rendered file
+JOB_ID_RE = re.compile(r'^(\d+)-([0-9a-f]{40})$')
+
+# Job state lives next to the output in the instance folder so every worker
+# process sees it: <job>.pending while rendering, then <job>.pdf or <job>.failed
+PENDING_SUFFIX = '.pending'
+FAILED_SUFFIX = '.failed'
+
+_executor = None
+_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def _get_executor(app):
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('REPORT_WORKERS', 2),
+                thread_name_prefix='report'
+            )
+    return _executor
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path):
+    # Status polls resolve report paths constantly; create the folder once per process
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _reports_dir(app):
+    return _ensure_dir(os.path.join(app.instance_path, 'reports'))
+
+
+def report_path(job_id, app=None):
+    return os.path.join(_reports_dir(app or current_app), f'{job_id}.pdf')
+
+
+def _marker(path, suffix):
+    return path[:-len('.pdf')] + suffix
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _age(path):
+    try:
+        return time.time() - os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(path, data):
+    # Write then rename so a half-written file is never served
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
+
+
+def _prune(app):
+    # Sweep files past the retention window, at most once per interval per process.
+    # Older versions of a report are left to this sweep: jobs can finish out of
+    # order, so a render cannot tell whether another file is older or newer
+    global _last_prune
+    now = time.time()
+    interval = app.config.get('REPORT_PRUNE_INTERVAL', 600)
+    with _lock:
+        if now - _last_prune < interval:
+            return
+        _last_prune = now
+    cutoff = now - app.config.get('REPORT_RETENTION_HOURS', 24) * 3600
+    with os.scandir(_reports_dir(app)) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    _remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def _render(app, project_id, job_id, path):
+    with app.app_context():
+        try:
+            # Imported here so only workers that render PDFs load reportlab
+            from app.pdf_report import build_project_pdf
+            from models.project import Project
+            project = db.session.get(Project, project_id)
+            _write_atomic(path, build_project_pdf(project).getvalue())
+        except Exception as exc:
+            logging.exception("Report job %s failed", job_id)
+            _write_atomic(_marker(path, FAILED_SUFFIX), str(exc).encode('utf-8'))
+        finally:
+            _remove(_marker(path, PENDING_SUFFIX))
+            db.session.remove()
+
+
+def submit_pdf_job(project_id, etag):
+    app = current_app._get_current_object()
+    _prune(app)
+    job_id = f'{project_id}-{etag}'
+    path = report_path(job_id, app)
+    if os.path.exists(path):
+        return job_id
+    # A failed attempt is retried on the next submit
+    _remove(_marker(path, FAILED_SUFFIX))
+    pending = _marker(path, PENDING_SUFFIX)
+    try:
+        # O_EXCL makes exactly one worker, across processes, own the render
+        os.close(os.open(pending, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        age = _age(pending)
+        if age is not None and age < app.config.get('REPORT_JOB_TIMEOUT', 600):
+            return job_id
+        # The worker that claimed it died; take the job over
+        os.close(os.open(pending, os.O_CREAT | os.O_WRONLY))
+        os.utime(pending)
+    _get_executor(app).submit(_render, app, project_id, job_id, path)
+    return job_id
+
+
+def job_status(job_id):
+    path = report_path(job_id)
+    if os.path.exists(path):
+        return 'done'
+    if os.path.exists(_marker(path, FAILED_SUFFIX)):
+        return 'failed'
+    age = _age(_marker(path, PENDING_SUFFIX))
+    if age is None:
+        return None
+    if age >= current_app.config.get('REPORT_JOB_TIMEOUT', 600):
+        return 'failed'
+    return 'pending'
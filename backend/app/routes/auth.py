@@ -1,25 +1,52 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app import db, limiter
+from flask_limiter.util import get_remote_address
+from app import db, limiter, cache
+from app.utils import current_role
 from models.user import User
 from datetime import datetime
 from marshmallow import ValidationError
-from app.schemas import LoginSchema, RegisterSchema
+from app.schemas import login_schema, register_schema
+import orjson
 
 auth_bp = Blueprint('auth', __name__)
 
+USER_CACHE_TTL = 60
+USERS_CACHE_TTL = 30
+USERS_CACHE_KEY = 'users:all'
+
+USERS_STREAM_BATCH = 500
+USER_LIST_COLUMNS = (User.id, User.name, User.email, User.role, User.created_at, User.updated_at)
+
+
+def _stream_json_rows(result):
+    # Encode one JSON array a partition at a time so memory stays flat
+    yield b'['
+    first = True
+    for partition in result.partitions():
+        chunk = b','.join(orjson.dumps(dict(row._mapping)) for row in partition)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
+def _login_rate_key():
+    # Throttle per account so rotating source IPs doesn't bypass the limit
+    data = request.get_json(silent=True) or {}
+    email = data.get('email') if isinstance(data, dict) else None
+    return email or get_remote_address()
+
 @auth_bp.route('/login', methods=['POST'])
-@limiter.limit("5 per minute")
+@limiter.limit("5 per minute", key_func=_login_rate_key)
 def login():
     try:
-        data = LoginSchema().load(request.get_json() or {})
+        data = login_schema.load(request.get_json() or {})
     except ValidationError as err:
         return jsonify({'error': err.messages}), 400
     
     user = User.query.filter_by(email=data['email']).first()
     
     if user and user.check_password(data['password']):
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims={'role': user.role})
         return jsonify({
             'access_token': access_token,
             'user': user.to_dict()
@@ -31,11 +58,11 @@ def login():
 @limiter.limit("3 per minute")
 def register():
     try:
-        data = RegisterSchema().load(request.get_json() or {})
+        data = register_schema.load(request.get_json() or {})
     except ValidationError as err:
         return jsonify({'error': err.messages}), 400
     
-    if User.query.filter_by(email=data['email']).first():
+    if db.session.query(db.exists().where(User.email == data['email'])).scalar():
         return jsonify({'error': 'Email already registered'}), 400
     
     user = User(
@@ -47,8 +74,9 @@ def register():
     
     db.session.add(user)
     db.session.commit()
+    cache.delete(USERS_CACHE_KEY)
     
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims={'role': user.role})
     return jsonify({
         'access_token': access_token,
         'user': user.to_dict()
@@ -58,21 +86,39 @@ def register():
 @jwt_required()
 def get_current_user():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    key = f'user:{user_id}'
+    body = cache.get(key)
     
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    if body is None:
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        body = orjson.dumps(user.to_dict())
+        cache.setex(key, USER_CACHE_TTL, body)
     
-    return jsonify(user.to_dict()), 200
+    return current_app.response_class(body, mimetype='application/json'), 200
 
 @auth_bp.route('/users', methods=['GET'])
 @jwt_required()
 def get_users():
-    user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
-    
-    if not current_user or current_user.role != 'admin':
+    if current_role() != 'admin':
         return jsonify({'error': 'Admin access required'}), 403
     
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users]), 200
+    body = cache.get(USERS_CACHE_KEY)
+    if body is not None:
+        return current_app.response_class(body, mimetype='application/json'), 200
+    
+    result = db.session.execute(
+        db.select(*USER_LIST_COLUMNS).order_by(User.id).execution_options(yield_per=USERS_STREAM_BATCH)
+    )
+    
+    def generate():
+        parts = [] if cache.enabled else None
+        for part in _stream_json_rows(result):
+            if parts is not None:
+                parts.append(part)
+            yield part
+        if parts is not None:
+            cache.setex(USERS_CACHE_KEY, USERS_CACHE_TTL, b''.join(parts))
+    
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json'), 200
@@ -1,59 +1,64 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
+from app.utils import cached_get, current_role, paginate
 from models.comment import Comment
-from models.project import Project
-from models.user import User
-from datetime import datetime
+from models.project import Project, bump_report_version
+from sqlalchemy import text
 
 comments_bp = Blueprint('comments', __name__)
 
+DELETE_COMMENT_TREE = text("""
+    WITH RECURSIVE tree(id) AS (
+        SELECT id FROM comments WHERE id = :comment_id
+        UNION ALL
+        SELECT c.id FROM comments c JOIN tree t ON c.parent_id = t.id
+    )
+    DELETE FROM comments WHERE id IN (SELECT id FROM tree)
+""")
+
 @comments_bp.route('/project/<int:project_id>', methods=['GET'])
 @jwt_required()
 def get_project_comments(project_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    project = Project.query.get_or_404(project_id)
+    project = cached_get(Project, project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     # Pagination
     page = max(int(request.args.get('page', 1)), 1)
     per_page = min(max(int(request.args.get('per_page', 20)), 1), 100)
-    query = Comment.query.filter_by(project_id=project_id, parent_id=None).order_by(Comment.created_at.desc())
-    pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        'items': [c.to_dict() for c in pagination.items],
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total': pagination.total,
-        'pages': pagination.pages,
-    }), 200
+    query = db.select(Comment).filter_by(project_id=project_id, parent_id=None).order_by(Comment.created_at.desc())
+    items, meta = paginate(query, page, per_page)
+    return jsonify({'items': [c.to_dict() for c in items], **meta}), 200
 
 @comments_bp.route('/replies/<int:comment_id>', methods=['GET'])
 @jwt_required()
 def get_comment_replies(comment_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    parent_comment = Comment.query.get_or_404(comment_id)
-    project = Project.query.get_or_404(parent_comment.project_id)
+    parent_comment = cached_get(Comment, comment_id)
+    project = cached_get(Project, parent_comment.project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
-    replies = Comment.query.filter_by(parent_id=comment_id).order_by(Comment.created_at.asc()).all()
+    replies = db.session.execute(
+        db.select(Comment).filter_by(parent_id=comment_id).order_by(Comment.created_at.asc())
+    ).scalars().all()
     return jsonify([reply.to_dict() for reply in replies]), 200
 
 @comments_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_comment():
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
     data = request.get_json()
     
@@ -61,13 +66,13 @@ def create_comment():
         return jsonify({'error': 'Project ID and text are required'}), 400
     
     # Check if user has access to the project
-    project = Project.query.get_or_404(data['project_id'])
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    project = cached_get(Project, data['project_id'])
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     # If this is a reply, check if parent comment exists and belongs to the same project
     if data.get('parent_id'):
-        parent_comment = Comment.query.get_or_404(data['parent_id'])
+        parent_comment = cached_get(Comment, data['parent_id'])
         if parent_comment.project_id != data['project_id']:
             return jsonify({'error': 'Parent comment does not belong to this project'}), 400
     
@@ -87,17 +92,17 @@ def create_comment():
 @jwt_required()
 def update_comment(comment_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    comment = Comment.query.get_or_404(comment_id)
-    project = Project.query.get_or_404(comment.project_id)
+    comment = cached_get(Comment, comment_id)
+    project = cached_get(Project, comment.project_id)
     
     # Check permissions - only comment author or admin can edit
-    if current_user.role != 'admin' and comment.user_id != user_id:
+    if role != 'admin' and comment.user_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     # Check if user has access to the project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     data = request.get_json()
@@ -105,7 +110,6 @@ def update_comment(comment_id):
     if data.get('text'):
         comment.text = data['text']
     
-    comment.updated_at = datetime.utcnow()
     db.session.commit()
     
     return jsonify(comment.to_dict()), 200
@@ -114,24 +118,22 @@ def update_comment(comment_id):
 @jwt_required()
 def delete_comment(comment_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    comment = Comment.query.get_or_404(comment_id)
-    project = Project.query.get_or_404(comment.project_id)
+    comment = cached_get(Comment, comment_id)
+    project = cached_get(Project, comment.project_id)
     
     # Check permissions - only comment author, project owner, or admin can delete
-    if current_user.role != 'admin' and comment.user_id != user_id and project.owner_id != user_id:
+    if role != 'admin' and comment.user_id != user_id and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     # Check if user has access to the project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
-    # Delete replies first
-    Comment.query.filter_by(parent_id=comment_id).delete()
-    
-    # Delete the comment
-    db.session.delete(comment)
+    # Delete the comment and its whole reply tree in one statement
+    db.session.execute(DELETE_COMMENT_TREE, {'comment_id': comment_id})
+    bump_report_version(db.session, Project.id == project.id)
     db.session.commit()
     
     return jsonify({'message': 'Comment deleted successfully'}), 200
@@ -1,56 +1,55 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
+from app.utils import cached_get, current_role, paginate
 from models.goal import Goal
 from models.project import Project
-from models.user import User
-from datetime import datetime
 from marshmallow import ValidationError
-from app.schemas import GoalCreateSchema
+from app.schemas import goal_create_schema
 
 goals_bp = Blueprint('goals', __name__)
 
+GOAL_LIST_COLUMNS = (
+    Goal.id, Goal.project_id, Goal.description, Goal.bim_use, Goal.success_metric,
+    Goal.priority, Goal.status, Goal.created_at, Goal.updated_at,
+)
+
 @goals_bp.route('/project/<int:project_id>', methods=['GET'])
 @jwt_required()
 def get_project_goals(project_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    project = Project.query.get_or_404(project_id)
+    project = cached_get(Project, project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     page = max(int(request.args.get('page', 1)), 1)
     per_page = min(max(int(request.args.get('per_page', 50)), 1), 200)
-    pagination = Goal.query.filter_by(project_id=project_id).order_by(Goal.created_at.desc()) \
-        .paginate(page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        'items': [g.to_dict() for g in pagination.items],
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total': pagination.total,
-        'pages': pagination.pages,
-    }), 200
+    # Goal.to_dict only reads columns, so skip ORM hydration for the listing
+    query = db.select(*GOAL_LIST_COLUMNS).where(Goal.project_id == project_id).order_by(Goal.created_at.desc())
+    rows, meta = paginate(query, page, per_page, mappings=True)
+    return jsonify({'items': [dict(row) for row in rows], **meta}), 200
 
 @goals_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_goal():
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
     try:
-        data = GoalCreateSchema().load(request.get_json() or {})
+        data = goal_create_schema.load(request.get_json() or {})
     except ValidationError as err:
         return jsonify({'error': err.messages}), 400
     
     # Check if user has access to the project
-    project = Project.query.get_or_404(data['project_id'])
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    project = cached_get(Project, data['project_id'])
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     goal = Goal(
@@ -71,16 +70,16 @@ def create_goal():
 @jwt_required()
 def update_goal(goal_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    goal = Goal.query.get_or_404(goal_id)
-    project = Project.query.get_or_404(goal.project_id)
+    goal = cached_get(Goal, goal_id)
+    project = cached_get(Project, goal.project_id)
     
     # Check permissions
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     data = request.get_json()
@@ -96,7 +95,6 @@ def update_goal(goal_id):
     if data.get('status'):
         goal.status = data['status']
     
-    goal.updated_at = datetime.utcnow()
     db.session.commit()
     
     return jsonify(goal.to_dict()), 200
@@ -105,16 +103,16 @@ def update_goal(goal_id):
 @jwt_required()
 def delete_goal(goal_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    goal = Goal.query.get_or_404(goal_id)
-    project = Project.query.get_or_404(goal.project_id)
+    goal = cached_get(Goal, goal_id)
+    project = cached_get(Project, goal.project_id)
     
     # Check permissions
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     db.session.delete(goal)
@@ -1,235 +1,248 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from app import db, cache
+from app.utils import cached_get, current_role
+from app.reports_tasks import JOB_ID_RE, job_status, report_path, submit_pdf_job
 from models.project import Project
 from models.goal import Goal
 from models.tidp import TIDP
 from models.comment import Comment
 from models.user import User
-# pandas not required for current implementation; keep import only when adding dataframe based exports
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from io import BytesIO
 from datetime import datetime
+from io import BytesIO, StringIO
 import csv
+import hashlib
+import unicodedata
+from urllib.parse import quote
 
 reports_bp = Blueprint('reports', __name__)
 
+CSV_BATCH_SIZE = 1000
+PDF_CACHE_TTL = 3600
+
+def _flush(buffer):
+    # Encode everything buffered so far in one call and reset the buffer
+    data = buffer.getvalue().encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+def _csv_section(buffer, writer, title, header, rows, trailing_blank=True):
+    # Title and header are only written once the first row arrives, so empty
+    # sections are skipped without a separate existence query
+    wrote_any = False
+    for i, row in enumerate(rows, 1):
+        if not wrote_any:
+            writer.writerow([title])
+            writer.writerow(header)
+            wrote_any = True
+        writer.writerow(row)
+        if i % CSV_BATCH_SIZE == 0:
+            yield _flush(buffer)
+    if wrote_any:
+        if trailing_blank:
+            writer.writerow([])
+        yield _flush(buffer)
+
+def _report_etag(project):
+    # report_version moves on every write that changes what a report renders
+    return hashlib.sha1(f'{project.id}:{project.report_version}'.encode()).hexdigest()
+
+def _report_filename(project, ext):
+    return f"BEP_Report_{project.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.{ext}"
+
+def _set_attachment(response, filename):
+    # Same encoding as send_file: headers must be latin-1, so non-ASCII names
+    # get an ASCII fallback plus an RFC 5987 filename*
+    try:
+        filename.encode('ascii')
+        names = {'filename': filename}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': simple, 'filename*': f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"}
+    response.headers.set('Content-Disposition', 'attachment', **names)
+
+def _not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
 @reports_bp.route('/project/<int:project_id>/pdf', methods=['GET'])
 @jwt_required()
 def generate_project_pdf(project_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    project = Project.query.get_or_404(project_id)
+    project = cached_get(Project, project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
-    # Create PDF buffer
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    story = []
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=1  # Center alignment
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        spaceBefore=20
+    etag = _report_etag(project)
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
+    
+    cache_key = f'report:pdf:{project_id}:{etag}'
+    data = cache.get(cache_key)
+    if data is None:
+        # Imported on first use so workers that never render PDFs skip loading reportlab
+        from app.pdf_report import build_project_pdf
+        data = build_project_pdf(project).getvalue()
+        cache.setex(cache_key, PDF_CACHE_TTL, data)
+    
+    response = send_file(
+        BytesIO(data),
+        as_attachment=True,
+        download_name=_report_filename(project, 'pdf'),
+        mimetype='application/pdf'
     )
+    response.set_etag(etag)
+    return response
+
+@reports_bp.route('/project/<int:project_id>/pdf', methods=['POST'])
+@jwt_required()
+def queue_project_pdf(project_id):
+    user_id = get_jwt_identity()
+    role = current_role()
     
-    # Title
-    story.append(Paragraph(f"BIM Execution Plan - {project.name}", title_style))
-    story.append(Spacer(1, 20))
-    
-    # Project Information
-    story.append(Paragraph("Project Information", heading_style))
-    project_info = [
-        ['Project Name:', project.name],
-        ['Location:', project.location],
-        ['Client:', project.client],
-        ['Delivery Method:', project.delivery_method],
-        ['Status:', project.status],
-        ['Created:', project.created_at.strftime('%B %d, %Y') if project.created_at else 'N/A']
-    ]
-    
-    if project.description:
-        project_info.append(['Description:', project.description])
-    
-    project_table = Table(project_info, colWidths=[2*inch, 4*inch])
-    project_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.grey),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(project_table)
-    story.append(Spacer(1, 20))
-    
-    # Goals and BIM Uses
-    goals = Goal.query.filter_by(project_id=project_id).all()
-    if goals:
-        story.append(Paragraph("Project Goals & BIM Uses", heading_style))
-        goals_data = [['Description', 'BIM Use', 'Success Metric', 'Priority', 'Status']]
-        for goal in goals:
-            goals_data.append([
-                goal.description[:50] + '...' if len(goal.description) > 50 else goal.description,
-                goal.bim_use,
-                goal.success_metric[:50] + '...' if len(goal.success_metric) > 50 else goal.success_metric,
-                goal.priority.title(),
-                goal.status.title()
-            ])
-        
-        goals_table = Table(goals_data, colWidths=[1.5*inch, 1.2*inch, 1.5*inch, 0.8*inch, 0.8*inch])
-        goals_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(goals_table)
-        story.append(Spacer(1, 20))
-    
-    # TIDP Entries
-    tidp_entries = TIDP.query.filter_by(project_id=project_id).all()
-    if tidp_entries:
-        story.append(Paragraph("Task Information Delivery Plan (TIDP)", heading_style))
-        tidp_data = [['Description', 'Responsible', 'Due Date', 'File Format', 'Status']]
-        for entry in tidp_entries:
-            tidp_data.append([
-                entry.description[:40] + '...' if len(entry.description) > 40 else entry.description,
-                entry.responsible_user.name if entry.responsible_user else 'N/A',
-                entry.due_date.strftime('%Y-%m-%d') if entry.due_date else 'N/A',
-                entry.file_format,
-                entry.status.title()
-            ])
-        
-        tidp_table = Table(tidp_data, colWidths=[1.8*inch, 1.2*inch, 1*inch, 1*inch, 1*inch])
-        tidp_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(tidp_table)
-        story.append(Spacer(1, 20))
-    
-    # Recent Comments
-    comments = Comment.query.filter_by(project_id=project_id, parent_id=None).order_by(Comment.created_at.desc()).limit(5).all()
-    if comments:
-        story.append(Paragraph("Recent Comments", heading_style))
-        for comment in comments:
-            comment_text = f"<b>{comment.user.name}</b> - {comment.created_at.strftime('%Y-%m-%d %H:%M')}"
-            story.append(Paragraph(comment_text, styles['Normal']))
-            story.append(Paragraph(comment.text, styles['Normal']))
-            story.append(Spacer(1, 10))
-    
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
+    project = cached_get(Project, project_id)
     
-    return send_file(
-        buffer,
+    # Check if user has access to this project
+    if role != 'admin' and project.owner_id != user_id:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    # Rendering happens on a background thread; the client polls the job
+    job_id = submit_pdf_job(project_id, _report_etag(project))
+    return _job_response(job_id, job_status(job_id)), 202
+
+@reports_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_report_job(job_id):
+    status, error = _authorized_job(job_id)
+    if error:
+        return error
+    return _job_response(job_id, status), 200
+
+@reports_bp.route('/jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+def download_report_job(job_id):
+    status, error = _authorized_job(job_id)
+    if error:
+        return error
+    if status != 'done':
+        return jsonify({'error': f'Report is {status}'}), 409
+    
+    project = cached_get(Project, int(job_id.split('-', 1)[0]))
+    response = send_file(
+        report_path(job_id),
         as_attachment=True,
-        download_name=f"BEP_Report_{project.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf",
+        download_name=_report_filename(project, 'pdf'),
         mimetype='application/pdf'
     )
+    response.set_etag(job_id.split('-', 1)[1])
+    return response
+
+def _authorized_job(job_id):
+    match = JOB_ID_RE.match(job_id)
+    if not match:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    
+    project = cached_get(Project, int(match.group(1)))
+    if current_role() != 'admin' and project.owner_id != get_jwt_identity():
+        return None, (jsonify({'error': 'Access denied'}), 403)
+    
+    status = job_status(job_id)
+    if status is None:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    return status, None
+
+def _job_response(job_id, status):
+    body = {'job_id': job_id, 'status': status}
+    if status == 'done':
+        body['url'] = url_for('reports.download_report_job', job_id=job_id)
+    return jsonify(body)
 
 @reports_bp.route('/project/<int:project_id>/csv', methods=['GET'])
 @jwt_required()
 def generate_project_csv(project_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    project = Project.query.get_or_404(project_id)
+    project = cached_get(Project, project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
-    # Create CSV buffer
-    buffer = BytesIO()
-    writer = csv.writer(buffer)
-    
-    # Project Information
-    writer.writerow(['BIM Execution Plan Report'])
-    writer.writerow([f'Project: {project.name}'])
-    writer.writerow([f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'])
-    writer.writerow([])
-    
-    writer.writerow(['Project Information'])
-    writer.writerow(['Name', 'Location', 'Client', 'Delivery Method', 'Status'])
-    writer.writerow([project.name, project.location, project.client, project.delivery_method, project.status])
-    writer.writerow([])
-    
-    # Goals
-    goals = Goal.query.filter_by(project_id=project_id).all()
-    if goals:
-        writer.writerow(['Project Goals & BIM Uses'])
-        writer.writerow(['Description', 'BIM Use', 'Success Metric', 'Priority', 'Status'])
-        for goal in goals:
-            writer.writerow([goal.description, goal.bim_use, goal.success_metric, goal.priority, goal.status])
-        writer.writerow([])
+    etag = _report_etag(project)
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
     
-    # TIDP Entries
-    tidp_entries = TIDP.query.filter_by(project_id=project_id).all()
-    if tidp_entries:
-        writer.writerow(['Task Information Delivery Plan (TIDP)'])
-        writer.writerow(['Description', 'Responsible', 'Due Date', 'File Format', 'Status', 'Notes'])
-        for entry in tidp_entries:
-            writer.writerow([
-                entry.description,
-                entry.responsible_user.name if entry.responsible_user else 'N/A',
-                entry.due_date.strftime('%Y-%m-%d') if entry.due_date else 'N/A',
-                entry.file_format,
-                entry.status,
-                entry.notes or ''
-            ])
+    def generate():
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        
+        # Project Information
+        writer.writerow(['BIM Execution Plan Report'])
+        writer.writerow([f'Project: {project.name}'])
+        writer.writerow([f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'])
         writer.writerow([])
-    
-    # Comments
-    comments = Comment.query.filter_by(project_id=project_id, parent_id=None).order_by(Comment.created_at.desc()).all()
-    if comments:
-        writer.writerow(['Comments'])
-        writer.writerow(['User', 'Date', 'Comment'])
-        for comment in comments:
-            writer.writerow([
-                comment.user.name,
-                comment.created_at.strftime('%Y-%m-%d %H:%M'),
-                comment.text
-            ])
-    
-    buffer.seek(0)
-    
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=f"BEP_Report_{project.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv",
-        mimetype='text/csv'
-    )
+        
+        writer.writerow(['Project Information'])
+        writer.writerow(['Name', 'Location', 'Client', 'Delivery Method', 'Status'])
+        writer.writerow([project.name, project.location, project.client, project.delivery_method, project.status])
+        writer.writerow([])
+        yield _flush(buffer)
+        
+        # Rows are streamed from the database in batches as plain column
+        # tuples; autoflush is off since nothing is written during the export
+        with db.session.no_autoflush:
+            goals = db.session.query(Goal.description, Goal.bim_use, Goal.success_metric, Goal.priority, Goal.status) \
+                .filter(Goal.project_id == project_id).yield_per(CSV_BATCH_SIZE)
+            yield from _csv_section(
+                buffer, writer, 'Project Goals & BIM Uses',
+                ['Description', 'BIM Use', 'Success Metric', 'Priority', 'Status'],
+                goals
+            )
+            
+            # TIDP Entries
+            tidp_entries = db.session.query(
+                TIDP.description, User.name, TIDP.due_date, TIDP.file_format, TIDP.status, TIDP.notes
+            ).outerjoin(User, TIDP.responsible_user_id == User.id) \
+                .filter(TIDP.project_id == project_id).yield_per(CSV_BATCH_SIZE)
+            yield from _csv_section(
+                buffer, writer, 'Task Information Delivery Plan (TIDP)',
+                ['Description', 'Responsible', 'Due Date', 'File Format', 'Status', 'Notes'],
+                (
+                    [
+                        description,
+                        user_name or 'N/A',
+                        due_date.strftime('%Y-%m-%d') if due_date else 'N/A',
+                        file_format,
+                        status,
+                        notes or ''
+                    ]
+                    for description, user_name, due_date, file_format, status, notes in tidp_entries
+                )
+            )
+            
+            # Comments
+            comments = db.session.query(User.name, Comment.created_at, Comment.text) \
+                .join(User, Comment.user_id == User.id) \
+                .filter(Comment.project_id == project_id, Comment.parent_id.is_(None)) \
+                .order_by(Comment.created_at.desc()).yield_per(CSV_BATCH_SIZE)
+            yield from _csv_section(
+                buffer, writer, 'Comments',
+                ['User', 'Date', 'Comment'],
+                (
+                    [user_name, created_at.strftime('%Y-%m-%d %H:%M'), text]
+                    for user_name, created_at, text in comments
+                ),
+                trailing_blank=False
+            )
+    
+    response = Response(stream_with_context(generate()), content_type='text/csv; charset=utf-8')
+    _set_attachment(response, _report_filename(project, 'csv'))
+    response.set_etag(etag)
+    return response
@@ -1,38 +1,44 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
+from app.utils import cached_get, current_role, paginate
 from models.tidp import TIDP
 from models.project import Project
 from models.user import User
-from datetime import datetime
+from sqlalchemy.orm import joinedload
 from marshmallow import ValidationError
-from app.schemas import TIDPCreateSchema
+from app.schemas import tidp_create_schema, tidp_update_schema
 
 tidp_bp = Blueprint('tidp', __name__)
 
+def _serialize_entries(entries):
+    # One IN (...) lookup for the page's responsible users instead of a lazy load per row
+    user_ids = {e.responsible_user_id for e in entries}
+    user_ids.discard(None)
+    names = dict(db.session.execute(db.select(User.id, User.name).where(User.id.in_(user_ids))).all()) if user_ids else {}
+    return [e.to_dict(responsible_user_name=names.get(e.responsible_user_id)) for e in entries]
+
+def _get_tidp_with_project(tidp_id):
+    # The access check needs the owning project; load both in one query
+    return db.one_or_404(db.select(TIDP).options(joinedload(TIDP.project)).filter_by(id=tidp_id))
+
 @tidp_bp.route('/project/<int:project_id>', methods=['GET'])
 @jwt_required()
 def get_project_tidp(project_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    project = Project.query.get_or_404(project_id)
+    project = cached_get(Project, project_id)
     
     # Check if user has access to this project
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     page = max(int(request.args.get('page', 1)), 1)
     per_page = min(max(int(request.args.get('per_page', 50)), 1), 200)
-    query = TIDP.query.filter_by(project_id=project_id).order_by(TIDP.due_date.asc())
-    pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        'items': [e.to_dict() for e in pagination.items],
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total': pagination.total,
-        'pages': pagination.pages,
-    }), 200
+    query = db.select(TIDP).filter_by(project_id=project_id).order_by(TIDP.due_date.asc())
+    items, meta = paginate(query, page, per_page)
+    return jsonify({'items': _serialize_entries(items), **meta}), 200
 
 @tidp_bp.route('/my-tasks', methods=['GET'])
 @jwt_required()
@@ -40,33 +46,27 @@ def get_my_tasks():
     user_id = get_jwt_identity()
     page = max(int(request.args.get('page', 1)), 1)
     per_page = min(max(int(request.args.get('per_page', 50)), 1), 200)
-    query = TIDP.query.filter_by(responsible_user_id=user_id).order_by(TIDP.due_date.asc())
-    pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        'items': [e.to_dict() for e in pagination.items],
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total': pagination.total,
-        'pages': pagination.pages,
-    }), 200
+    query = db.select(TIDP).filter_by(responsible_user_id=user_id).order_by(TIDP.due_date.asc())
+    items, meta = paginate(query, page, per_page)
+    return jsonify({'items': _serialize_entries(items), **meta}), 200
 
 @tidp_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_tidp():
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
     try:
-        data = TIDPCreateSchema().load(request.get_json() or {})
+        data = tidp_create_schema.load(request.get_json() or {})
     except ValidationError as err:
         return jsonify({'error': err.messages}), 400
     
     # Check if user has access to the project
-    project = Project.query.get_or_404(data['project_id'])
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    project = cached_get(Project, data['project_id'])
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     due_date = data['due_date']
@@ -90,38 +90,26 @@ def create_tidp():
 @jwt_required()
 def update_tidp(tidp_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    tidp_entry = TIDP.query.get_or_404(tidp_id)
-    project = Project.query.get_or_404(tidp_entry.project_id)
+    tidp_entry = _get_tidp_with_project(tidp_id)
+    project = tidp_entry.project
     
     # Check permissions
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    if current_user.role != 'admin' and project.owner_id != user_id and tidp_entry.responsible_user_id != user_id:
+    if role != 'admin' and project.owner_id != user_id and tidp_entry.responsible_user_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
-    data = request.get_json()
-    
-    if data.get('description'):
-        tidp_entry.description = data['description']
-    if data.get('responsible_user_id'):
-        tidp_entry.responsible_user_id = data['responsible_user_id']
-    if data.get('due_date'):
-        try:
-            due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
-            tidp_entry.due_date = due_date
-        except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
-    if data.get('file_format'):
-        tidp_entry.file_format = data['file_format']
-    if data.get('status'):
-        tidp_entry.status = data['status']
-    if data.get('notes') is not None:
-        tidp_entry.notes = data['notes']
-    
-    tidp_entry.updated_at = datetime.utcnow()
+    try:
+        data = tidp_update_schema.load(request.get_json() or {})
+    except ValidationError as err:
+        return jsonify({'error': err.messages}), 400
+    
+    for field, value in data.items():
+        setattr(tidp_entry, field, value)
+    
     db.session.commit()
     
     return jsonify(tidp_entry.to_dict()), 200
@@ -130,16 +118,16 @@ def update_tidp(tidp_id):
 @jwt_required()
 def delete_tidp(tidp_id):
     user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
+    role = current_role()
     
-    tidp_entry = TIDP.query.get_or_404(tidp_id)
-    project = Project.query.get_or_404(tidp_entry.project_id)
+    tidp_entry = _get_tidp_with_project(tidp_id)
+    project = tidp_entry.project
     
     # Check permissions
-    if current_user.role not in ['admin', 'contributor']:
+    if role not in ['admin', 'contributor']:
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    if current_user.role != 'admin' and project.owner_id != user_id:
+    if role != 'admin' and project.owner_id != user_id:
         return jsonify({'error': 'Access denied'}), 403
     
     db.session.delete(tidp_entry)
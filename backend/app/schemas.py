@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import EXCLUDE, Schema, fields, validate
 
 
 non_empty_str = validate.Length(min=1)
@@ -43,3 +43,24 @@ class TIDPCreateSchema(Schema):
     notes = fields.String(load_default='')
 
 
+class TIDPUpdateSchema(Schema):
+    # Fields an update may change; project_id is fixed once the entry exists.
+    # Read-only fields from a GET (id, timestamps, names) are dropped, not rejected
+    class Meta:
+        unknown = EXCLUDE
+
+    description = fields.String(validate=non_empty_str)
+    responsible_user_id = fields.Integer(allow_none=True)
+    due_date = fields.Date(format='%Y-%m-%d')
+    file_format = fields.String(validate=non_empty_str)
+    status = fields.String(validate=validate.OneOf(['pending', 'in-progress', 'completed', 'overdue']))
+    notes = fields.String(allow_none=True)
+
+
+# Shared instances; Schema.load keeps no per-call state, so these are safe to reuse
+login_schema = LoginSchema()
+register_schema = RegisterSchema()
+project_create_schema = ProjectCreateSchema()
+goal_create_schema = GoalCreateSchema()
+tidp_create_schema = TIDPCreateSchema()
+tidp_update_schema = TIDPUpdateSchema(partial=True)
@@ -0,0 +1,45 @@
+from flask import g, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from app import db
+from models.user import User
+import math
+
+
+def cached_get(model, pk):
+    # Per-request memo of primary-key lookups; dropped on request teardown
+    cache = g.setdefault('_model_cache', {})
+    key = (model, pk)
+    if key not in cache:
+        cache[key] = db.get_or_404(model, pk)
+    return cache[key]
+
+
+def current_user_or_none():
+    # Only hit the database when the user row itself is needed, once per request
+    if '_current_user' not in g:
+        g._current_user = db.session.get(User, get_jwt_identity())
+    return g._current_user
+
+
+def current_role():
+    # Role is embedded in the access token at login/registration; tokens
+    # issued before the claim existed fall back to a lookup
+    role = get_jwt().get('role')
+    if role is None:
+        user = current_user_or_none()
+        role = user.role if user else None
+    return role
+
+
+def paginate(stmt, page, per_page, mappings=False):
+    # Fetch one extra row to detect a next page instead of running COUNT(*);
+    # the total is only computed when the client asks for ?with_total=1
+    result = db.session.execute(stmt.limit(per_page + 1).offset((page - 1) * per_page))
+    rows = (result.mappings() if mappings else result.scalars()).all()
+    meta = {'page': page, 'per_page': per_page, 'has_next': len(rows) > per_page}
+    if request.args.get('with_total', 0, type=int):
+        total = db.session.execute(
+            db.select(db.func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar_one()
+        meta.update(total=total, pages=math.ceil(total / per_page))
+    return rows[:per_page], meta
@@ -0,0 +1,53 @@
+import os
+
+os.environ['APP_CONFIG'] = 'testing'
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from models.user import User
+from models.project import Project
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(app):
+    user = User(name='BIM Manager', email='admin@example.com', role='admin')
+    user.set_password('admin123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(admin):
+    token = create_access_token(identity=admin.id, additional_claims={'role': admin.role})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def project(admin):
+    project = Project(
+        name='Downtown Office Complex',
+        location='New York, NY',
+        client='Metro Development Corp',
+        delivery_method='Design-Build',
+        owner_id=admin.id
+    )
+    db.session.add(project)
+    db.session.commit()
+    return project
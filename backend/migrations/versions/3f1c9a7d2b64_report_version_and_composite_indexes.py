@@ -0,0 +1,45 @@
+"""report_version and composite listing indexes
+
+Revision ID: 3f1c9a7d2b64
+Revises: 
+Create Date: 2026-10-16 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_projects_owner_created', 'projects', ['owner_id', 'created_at']),
+    ('ix_goals_project_created', 'goals', ['project_id', 'created_at']),
+    ('ix_tidp_project_due', 'tidp', ['project_id', 'due_date']),
+    ('ix_tidp_user_due', 'tidp', ['responsible_user_id', 'due_date']),
+    ('ix_comments_project_parent_created', 'comments', ['project_id', 'parent_id', 'created_at']),
+]
+
+
+def upgrade():
+    # Databases built by db.create_all() may already have any of these, so
+    # only add what is missing; this makes the first upgrade safe everywhere
+    inspector = sa.inspect(op.get_bind())
+
+    if 'report_version' not in {c['name'] for c in inspector.get_columns('projects')}:
+        op.add_column('projects', sa.Column('report_version', sa.Integer(), nullable=False, server_default='0'))
+
+    for name, table, columns in INDEXES:
+        if name not in {i['name'] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('report_version')
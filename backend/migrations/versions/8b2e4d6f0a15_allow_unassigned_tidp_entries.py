@@ -0,0 +1,30 @@
+"""allow unassigned TIDP entries
+
+Revision ID: 8b2e4d6f0a15
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-16 10:03:27.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f0a15'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tidp', schema=None) as batch_op:
+        batch_op.alter_column('responsible_user_id',
+               existing_type=sa.Integer(),
+               nullable=True)
+
+
+def downgrade():
+    with op.batch_alter_table('tidp', schema=None) as batch_op:
+        batch_op.alter_column('responsible_user_id',
+               existing_type=sa.Integer(),
+               nullable=False)
@@ -1,20 +1,26 @@
 from app import db
-from datetime import datetime
+from models.timestamps import utcnow
+from models.serialization import memoized_to_dict
 
 class Comment(db.Model):
     __tablename__ = 'comments'
+    __table_args__ = (
+        db.Index('ix_comments_project_parent_created', 'project_id', 'parent_id', 'created_at'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     text = db.Column(db.Text, nullable=False)
     parent_id = db.Column(db.Integer, db.ForeignKey('comments.id'), nullable=True, index=True)  # For threaded comments
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy=True)
     
+    @memoized_to_dict
     def to_dict(self):
         return {
             'id': self.id,
@@ -25,5 +31,17 @@ class Comment(db.Model):
             'parent_id': self.parent_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'replies_count': len(self.replies)
+            'replies_count': self.replies_count
         }
+
+
+# Counted in SQL alongside each comment row instead of loading every reply.
+# Built on a table alias: an ORM alias would configure every mapper at import
+# time, before related models such as TIDP have been imported
+_replies = Comment.__table__.alias('replies')
+Comment.replies_count = db.column_property(
+    db.select(db.func.count(_replies.c.id))
+    .where(_replies.c.parent_id == Comment.__table__.c.id)
+    .correlate_except(_replies)
+    .scalar_subquery()
+)
@@ -1,8 +1,13 @@
 from app import db
-from datetime import datetime
+from models.timestamps import utcnow
+from models.serialization import memoized_to_dict
 
 class Goal(db.Model):
     __tablename__ = 'goals'
+    __table_args__ = (
+        db.Index('ix_goals_project_created', 'project_id', 'created_at'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -11,9 +16,10 @@ class Goal(db.Model):
     success_metric = db.Column(db.Text, nullable=False)
     priority = db.Column(db.String(20), default='medium')  # low, medium, high
     status = db.Column(db.String(20), default='pending')  # pending, in-progress, completed
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
+    @memoized_to_dict
     def to_dict(self):
         return {
             'id': self.id,
@@ -1,8 +1,15 @@
 from app import db
-from datetime import datetime
+from models.timestamps import utcnow
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models.serialization import memoized_to_dict
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        db.Index('ix_projects_owner_created', 'owner_id', 'created_at'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -12,15 +19,39 @@ class Project(db.Model):
     description = db.Column(db.Text)
     status = db.Column(db.String(50), index=True, default='active')  # active, completed, on-hold
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
+    # Moves on every write that changes a rendered report; keys report ETags and caches
+    report_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     goals = db.relationship('Goal', backref='project', lazy=True, cascade='all, delete-orphan')
     tidp_entries = db.relationship('TIDP', backref='project', lazy=True, cascade='all, delete-orphan')
     comments = db.relationship('Comment', backref='project', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    @staticmethod
+    def child_counts(project_ids):
+        # One grouped COUNT per child table for a whole page of projects
+        from models.goal import Goal
+        from models.tidp import TIDP
+        from models.comment import Comment
+        counts = {pid: {'goals_count': 0, 'tidp_count': 0, 'comments_count': 0} for pid in project_ids}
+        if not counts:
+            return counts
+        for model, key in ((Goal, 'goals_count'), (TIDP, 'tidp_count'), (Comment, 'comments_count')):
+            rows = db.session.execute(
+                db.select(model.project_id, db.func.count())
+                .where(model.project_id.in_(counts))
+                .group_by(model.project_id)
+            )
+            for pid, n in rows:
+                counts[pid][key] = n
+        return counts
+    
+    @memoized_to_dict
+    def to_dict(self, counts=None):
+        if counts is None:
+            counts = self.child_counts([self.id])[self.id]
         return {
             'id': self.id,
             'name': self.name,
@@ -33,8 +64,54 @@ class Project(db.Model):
             'owner_name': self.owner.name if self.owner else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            # Counts may cause N+1; consider denormalization or subqueries for large datasets
-            'goals_count': len(self.goals),
-            'tidp_count': len(self.tidp_entries),
-            'comments_count': len(self.comments)
+            **counts
         }
+
+
+@event.listens_for(Session, 'before_flush')
+def _bump_report_versions(session, flush_context, instances):
+    # Timestamps only have one-second resolution on some backends, so reports
+    # are versioned by a counter bumped for any write to a project, its
+    # goals/TIDP/comments, or a user whose name those rows display
+    from models.goal import Goal
+    from models.tidp import TIDP
+    from models.comment import Comment
+    from models.user import User
+    project_ids = set()
+    renamed_user_ids = set()
+    changed = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in (*session.new, *changed, *session.deleted):
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+        elif isinstance(obj, (Goal, TIDP, Comment)):
+            project_ids.add(obj.project_id)
+            project_ids.update(inspect(obj).attrs.project_id.history.deleted)
+        elif isinstance(obj, User) and inspect(obj).attrs.name.history.has_changes():
+            renamed_user_ids.add(obj.id)
+    project_ids.discard(None)
+    renamed_user_ids.discard(None)
+
+    conditions = []
+    if project_ids:
+        conditions.append(Project.id.in_(project_ids))
+    if renamed_user_ids:
+        conditions.append(Project.id.in_(db.select(TIDP.project_id).where(TIDP.responsible_user_id.in_(renamed_user_ids))))
+        conditions.append(Project.id.in_(db.select(Comment.project_id).where(Comment.user_id.in_(renamed_user_ids))))
+    if conditions:
+        bump_report_version(session, *conditions)
+
+
+def bump_report_version(session, *conditions):
+    # Also called directly by routes that change report rows with bulk or raw
+    # SQL, which never goes through the flush and so skips the listener above
+    session.execute(
+        db.update(Project)
+        .where(db.or_(*conditions))
+        # Keep updated_at as is: its onupdate would otherwise mark the project
+        # itself as edited whenever a child row changes
+        .values(report_version=Project.report_version + 1, updated_at=Project.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Project):
+            session.expire(obj, ['report_version'])
@@ -0,0 +1,24 @@
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def memoized_to_dict(method):
+    # Cache the serialized form on the instance; sessions are request-scoped so
+    # the cache lives at most for one request. Calls with arguments are not cached.
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if args or kwargs:
+            return method(self, *args, **kwargs)
+        cached = self.__dict__.get('_cached_dict')
+        if cached is None:
+            cached = self._cached_dict = method(self)
+        return cached
+    return wrapper
+
+
+@event.listens_for(Session, 'before_flush')
+def _clear_cached_dicts(session, flush_context, instances):
+    # Anything about to be written may serialize differently afterwards
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        obj.__dict__.pop('_cached_dict', None)
@@ -1,27 +1,38 @@
 from app import db
-from datetime import datetime
+from models.timestamps import utcnow
+from models.serialization import memoized_to_dict
+from datetime import date
+from sqlalchemy.ext.hybrid import hybrid_property
 
 class TIDP(db.Model):
     __tablename__ = 'tidp'
+    __table_args__ = (
+        db.Index('ix_tidp_project_due', 'project_id', 'due_date'),
+        db.Index('ix_tidp_user_due', 'responsible_user_id', 'due_date'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
-    responsible_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    responsible_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)  # None while unassigned
     due_date = db.Column(db.Date, nullable=False, index=True)
     file_format = db.Column(db.String(100), nullable=False)  # e.g., "IFC", "DWG", "PDF"
     status = db.Column(db.String(20), default='pending', index=True)  # pending, in-progress, completed, overdue
     notes = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
-    def to_dict(self):
+    @memoized_to_dict
+    def to_dict(self, responsible_user_name=None):
+        if responsible_user_name is None and self.responsible_user:
+            responsible_user_name = self.responsible_user.name
         return {
             'id': self.id,
             'project_id': self.project_id,
             'description': self.description,
             'responsible_user_id': self.responsible_user_id,
-            'responsible_user_name': self.responsible_user.name if self.responsible_user else None,
+            'responsible_user_name': responsible_user_name,
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'file_format': self.file_format,
             'status': self.status,
@@ -30,7 +41,17 @@ class TIDP(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
-    def is_overdue(self):
+    def is_overdue(self, today=None):
+        # Callers checking many rows should pass today once rather than per row
         if self.due_date and self.status != 'completed':
-            return self.due_date < datetime.now().date()
+            return self.due_date < (today or date.today())
         return False
+    
+    @hybrid_property
+    def overdue(self):
+        return self.is_overdue()
+    
+    @overdue.expression
+    def overdue(cls):
+        # Evaluated by the database against CURRENT_DATE, usable in filters and ordering
+        return db.and_(cls.due_date < db.func.current_date(), cls.status != 'completed')
@@ -0,0 +1,32 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import DateTime
+
+
+# created_at and updated_at both use utcnow() as default, so a new row gets
+# the same value for each from one clock. updated_at also has it as
+# server_default and onupdate; the default still covers tables created before
+# the server default existed. The models set eager_defaults so generated values
+# come back through RETURNING rather than a follow-up SELECT.
+class utcnow(FunctionElement):
+    # Database-side current time in UTC; plain now() on PostgreSQL would use
+    # the session time zone
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is UTC but whole seconds only; %f keeps milliseconds.
+    # Parenthesised so it is also valid as a DDL DEFAULT
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
@@ -1,17 +1,19 @@
+from flask import current_app
 from app import db
+from models.timestamps import utcnow
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
 
 class User(db.Model):
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='viewer')  # admin, contributor, viewer
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     projects = db.relationship('Project', backref='owner', lazy=True)
@@ -19,7 +21,8 @@ class User(db.Model):
     comments = db.relationship('Comment', backref='user', lazy=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        self.password_hash = generate_password_hash(password, method=method)
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
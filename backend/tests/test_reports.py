@@ -0,0 +1,75 @@
+from app import db
+from models.comment import Comment
+from models.goal import Goal
+
+
+def test_csv_etag_changes_when_a_goal_is_edited(client, auth_headers, project):
+    goal = Goal(
+        project_id=project.id,
+        description='Coordinate MEP systems',
+        bim_use='3D Coordination',
+        success_metric='Zero unresolved clashes at handover'
+    )
+    db.session.add(goal)
+    db.session.commit()
+
+    first = client.get(f'/api/reports/project/{project.id}/csv', headers=auth_headers, buffered=True)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    # Same-second edits must still produce a new report version
+    goal.description = 'Coordinate MEP and structure'
+    db.session.commit()
+
+    second = client.get(
+        f'/api/reports/project/{project.id}/csv',
+        headers={**auth_headers, 'If-None-Match': etag},
+        buffered=True
+    )
+    assert second.status_code == 200
+    assert second.headers['ETag'] != etag
+    assert b'Coordinate MEP and structure' in second.data
+
+
+def test_csv_unchanged_project_is_not_modified(client, auth_headers, project):
+    first = client.get(f'/api/reports/project/{project.id}/csv', headers=auth_headers, buffered=True)
+
+    second = client.get(
+        f'/api/reports/project/{project.id}/csv',
+        headers={**auth_headers, 'If-None-Match': first.headers['ETag']},
+        buffered=True
+    )
+    assert second.status_code == 304
+
+
+def test_csv_non_ascii_project_name_uses_encoded_filename(client, auth_headers, project):
+    project.name = 'Café Ünïcode 项目'
+    db.session.commit()
+
+    res = client.get(f'/api/reports/project/{project.id}/csv', headers=auth_headers, buffered=True)
+
+    disposition = res.headers['Content-Disposition']
+    assert res.status_code == 200
+    disposition.encode('latin-1')
+    assert "filename*=UTF-8''BEP_Report_Caf%C3%A9_%C3%9Cn%C3%AFcode_%E9%A1%B9%E7%9B%AE_" in disposition
+
+
+def test_csv_etag_changes_when_a_comment_is_deleted(client, auth_headers, project, admin):
+    comment = Comment(project_id=project.id, user_id=admin.id, text='Clash report is ready for review')
+    db.session.add(comment)
+    db.session.commit()
+
+    first = client.get(f'/api/reports/project/{project.id}/csv', headers=auth_headers, buffered=True)
+    etag = first.headers['ETag']
+
+    res = client.delete(f'/api/comments/{comment.id}', headers=auth_headers)
+    assert res.status_code == 200
+
+    second = client.get(
+        f'/api/reports/project/{project.id}/csv',
+        headers={**auth_headers, 'If-None-Match': etag},
+        buffered=True
+    )
+    assert second.status_code == 200
+    assert second.headers['ETag'] != etag
+    assert b'Clash report is ready for review' not in second.data
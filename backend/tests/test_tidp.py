@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+from app import db
+from models.tidp import TIDP
+
+
+def _add_entry(project, user):
+    entry = TIDP(
+        project_id=project.id,
+        description='Architectural model - Schematic Design',
+        responsible_user_id=user.id,
+        due_date=date.today() + timedelta(days=30),
+        file_format='IFC'
+    )
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+def test_project_tidp_listing_includes_responsible_user_name(client, auth_headers, project, admin):
+    _add_entry(project, admin)
+
+    res = client.get(f'/api/tidp/project/{project.id}', headers=auth_headers)
+
+    assert res.status_code == 200
+    items = res.get_json()['items']
+    assert len(items) == 1
+    assert items[0]['responsible_user_name'] == 'BIM Manager'
+
+
+def test_my_tasks_listing_includes_responsible_user_name(client, auth_headers, project, admin):
+    _add_entry(project, admin)
+
+    res = client.get('/api/tidp/my-tasks', headers=auth_headers)
+
+    assert res.status_code == 200
+    items = res.get_json()['items']
+    assert [item['responsible_user_name'] for item in items] == ['BIM Manager']
+
+
+def test_update_accepts_the_entry_as_returned_and_can_unassign(client, auth_headers, project, admin):
+    entry = _add_entry(project, admin)
+    payload = client.get(f'/api/tidp/project/{project.id}', headers=auth_headers).get_json()['items'][0]
+    payload['responsible_user_id'] = None
+
+    res = client.put(f'/api/tidp/{entry.id}', json=payload, headers=auth_headers)
+
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body['responsible_user_id'] is None
+    assert body['responsible_user_name'] is None